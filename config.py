@@ -1,8 +1,15 @@
 # config.py
 import os
+from functools import lru_cache
+from types import MappingProxyType
+
 from dotenv import load_dotenv
 
-load_dotenv()
+# Parse .env once per process, even if this module gets re-imported
+# (e.g. by Streamlit's module reloading).
+if not os.environ.get("_ENV_LOADED"):
+    load_dotenv()
+    os.environ["_ENV_LOADED"] = "1"
 
 # ============ Thordata proxy settings ============
 PROXY_HOST = os.getenv("PROXY_HOST")
@@ -13,11 +20,21 @@ PROXY_PASS = os.getenv("PROXY_PASS")
 # Set USE_PROXY=0 in .env if you want to temporarily disable Thordata
 USE_PROXY = os.getenv("USE_PROXY", "1") == "1"
 
+# Set RESPECT_ROBOTS=0 in .env to skip the robots.txt check before fetching
+RESPECT_ROBOTS = os.getenv("RESPECT_ROBOTS", "1") == "1"
+
+# Set REFRESH_SECS (e.g. 21600) to skip items stored within that many seconds
+# on the next run; progress lives in CHECKPOINT_PATH. 0 (default) always refetches.
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "checkpoint.sqlite")
+REFRESH_SECS = int(os.getenv("REFRESH_SECS", "0"))
 
+
+@lru_cache(maxsize=1)
 def get_proxy_dict():
     """
-    Build a requests-compatible proxies dict using your Thordata
+    Build a scheme -> proxy URL dict using your Thordata
     residential proxy credentials. If USE_PROXY=0, returns {}.
+    Built once per process and shared, so callers must not mutate it.
     """
     if not USE_PROXY:
         return {}
@@ -32,15 +49,29 @@ def get_proxy_dict():
 
 
 # ============ SingleStore settings ============
+# Validated lazily in db.get_engine() so constants can be imported without a DB.
 SINGLESTORE_URI = os.getenv("SINGLESTORE_URI")
-if not SINGLESTORE_URI:
-    raise ValueError("SINGLESTORE_URI is not set in .env")
 
 
 # ============ OpenAI (for LangChain chat) ============
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 
+def _freeze(entries):
+    """
+    Turn a list of config dicts into a tuple of read-only mappings so the
+    route tables can be shared safely across threads and reruns. List values
+    (e.g. a stay's fallback URLs) become tuples too.
+    """
+    return tuple(
+        MappingProxyType({
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in entry.items()
+        })
+        for entry in entries
+    )
+
+
 # ============ Global Travel Date ============
 TRAVEL_DATE_STR = "2025-12-07"  # 7 Dec 2025
 
@@ -49,7 +80,7 @@ TRAVEL_DATE_STR = "2025-12-07"  # 7 Dec 2025
 PROVIDER_NAME = "Skyscanner"
 DEFAULT_CURRENCY = "INR"
 
-FLIGHT_ROUTES = [
+FLIGHT_ROUTES = _freeze([
     {
         "route_code": "BLR-DEL",
         "origin": "BLR",
@@ -114,11 +145,11 @@ FLIGHT_ROUTES = [
         "url": "https://www.skyscanner.co.in/routes/dxb/blr/dubai-to-bengaluru.html",
         "travel_date": TRAVEL_DATE_STR,
     },
-]
+])
 
 
 # ============ Hotels (OYO city buckets with Mumbai fallback) ============
-HOTEL_STAYS = [
+HOTEL_STAYS = _freeze([
     {
         "hotel_code": "OYO-BLR-ALL",
         "city": "Bengaluru",
@@ -141,11 +172,11 @@ HOTEL_STAYS = [
         "hotel_code": "OYO-BOM-ALL",
         "city": "Mumbai",
         "hotel_name": "All OYO Hotels in Mumbai",
-        "url": [
+        "url": (
             "https://www.oyorooms.com/oyos-in-mumbai/",
             "https://www.oyorooms.com/hotels-in-in-mumbai/",
             "https://www.oyorooms.com/budget-hotels-in-mumbai/",
-        ],
+        ),
         "checkin_date": TRAVEL_DATE_STR,
         "checkout_date": TRAVEL_DATE_STR,
     },
@@ -174,11 +205,11 @@ HOTEL_STAYS = [
         "checkin_date": TRAVEL_DATE_STR,
         "checkout_date": TRAVEL_DATE_STR,
     },
-]
+])
 
 
 # ============ Rental cab pages (Gozo Cabs) ============
-RENTAL_CAR_OFFERS = [
+RENTAL_CAR_OFFERS = _freeze([
     {
         "rental_code": "BLR-LOCAL-GOZO",
         "pickup_city": "Bengaluru",
@@ -219,4 +250,4 @@ RENTAL_CAR_OFFERS = [
         "url": "https://www.gozocabs.com/book-taxi/bangalore-coorgmadikeri",
         "travel_date": TRAVEL_DATE_STR,
     },
-]
\ No newline at end of file
+])
@@ -1,6 +1,10 @@
+import hashlib
+import re
+
 import pandas as pd
 import streamlit as st
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 
 from db import get_engine
 from config import OPENAI_API_KEY, TRAVEL_DATE_STR
@@ -10,81 +14,295 @@ from langchain_openai import ChatOpenAI
 # ---------- Data loaders ----------
 
 
-@st.cache_data(ttl=60)
-def load_flight_data() -> pd.DataFrame:
+# Low-cardinality labels are stored as categoricals (integer codes) and
+# prices as float32 to keep cached frames small.
+FLIGHT_CATEGORIES = ["route_code", "provider_name", "currency"]
+HOTEL_CATEGORIES = ["hotel_code", "city", "provider_name", "currency"]
+RENTAL_CATEGORIES = ["rental_code", "provider_name", "currency"]
+PRICE_COLUMNS = ["price", "min_price", "max_price", "avg_price"]
+
+
+def _tighten_dtypes(df: pd.DataFrame, categories) -> pd.DataFrame:
+    dtypes = {c: "category" for c in categories if c in df.columns}
+    dtypes.update({c: "float32" for c in PRICE_COLUMNS if c in df.columns})
+    return df.astype(dtypes)
+
+
+# Loaders take the table's latest scrape time purely as a cache key: while
+# no new scrape lands the key is unchanged and the cached frame is reused,
+# so only the tiny MAX() query below hits the database on reruns.
+#
+# The frames are cached with st.cache_resource, so every rerun and session
+# gets the *same* object back instead of a fresh unpickled copy. Treat them
+# as read-only: anything that needs to mutate a frame must .copy() it first.
+
+
+# MySQL error codes for a table that doesn't exist yet (1146) or predates a
+# column (1054). Only these mean "no data"; anything else (e.g. a dropped
+# connection) is raised so an empty frame never sits in the hour-long cache.
+_MISSING_SCHEMA_ERRORS = {1054, 1146}
+
+
+def _is_missing_schema(exc: DBAPIError) -> bool:
+    args = getattr(exc.orig, "args", ())
+    return bool(args) and args[0] in _MISSING_SCHEMA_ERRORS
+
+
+@st.cache_data(ttl=10)
+def latest_scrape_ts(table: str):
+    engine = get_engine()
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                text(f"SELECT MAX(scraped_at_utc) FROM {table}")
+            ).scalar()
+    except Exception:
+        return None
+
+
+@st.cache_resource(ttl=3600)
+def load_flight_history(latest_ts, bucket: str = "5m") -> pd.DataFrame:
+    """
+    Price history for the chart, averaged per route into TIME_BUCKET
+    windows server-side so the payload stays small as history grows.
+    """
     engine = get_engine()
     with engine.connect() as conn:
         df = pd.read_sql(
             text(
-                "SELECT * FROM flight_prices "
-                "ORDER BY scraped_at_utc ASC, route_code ASC"
+                """
+                SELECT TIME_BUCKET(:bucket, scraped_at_utc) AS `time`,
+                       route_code,
+                       AVG(price) AS price
+                FROM flight_prices
+                WHERE price IS NOT NULL
+                GROUP BY route_code, `time`
+                ORDER BY `time` ASC, route_code ASC
+                """
             ),
             conn,
+            params={"bucket": bucket},
+            parse_dates=["time"],
         )
-    return df
+    return _tighten_dtypes(df, FLIGHT_CATEGORIES)
+
 
+# The *_snapshot loaders return one row per group (the latest scrape) with
+# min/max/avg over the whole history, so summaries and "latest" tables never
+# have to pull the full history into pandas. Window functions compute the
+# aggregates and the latest row in a single pass over each partition.
 
-@st.cache_data(ttl=60)
-def load_hotel_data() -> pd.DataFrame:
+
+@st.cache_resource(ttl=3600)
+def load_flight_snapshot(latest_ts) -> pd.DataFrame:
+    engine = get_engine()
+    with engine.connect() as conn:
+        df = pd.read_sql(
+            text(
+                """
+                SELECT * FROM (
+                    SELECT f.*,
+                           MIN(price) OVER (PARTITION BY route_code, travel_date) AS min_price,
+                           MAX(price) OVER (PARTITION BY route_code, travel_date) AS max_price,
+                           AVG(price) OVER (PARTITION BY route_code, travel_date) AS avg_price,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY route_code, travel_date ORDER BY scraped_at_utc DESC
+                           ) AS rn
+                    FROM flight_prices f
+                ) t
+                WHERE rn = 1
+                ORDER BY route_code ASC, travel_date ASC
+                """
+            ),
+            conn,
+            parse_dates=["scraped_at_utc"],
+        )
+    return _tighten_dtypes(df.drop(columns="rn"), FLIGHT_CATEGORIES)
+
+
+@st.cache_resource(ttl=3600)
+def load_hotel_snapshot(latest_ts) -> pd.DataFrame:
     engine = get_engine()
     try:
         with engine.connect() as conn:
             df = pd.read_sql(
                 text(
-                    "SELECT * FROM hotel_rates "
-                    "ORDER BY scraped_at_utc ASC, hotel_code ASC"
+                    """
+                    SELECT * FROM (
+                        SELECT h.*,
+                               MIN(price) OVER (PARTITION BY hotel_code, city) AS min_price,
+                               MAX(price) OVER (PARTITION BY hotel_code, city) AS max_price,
+                               AVG(price) OVER (PARTITION BY hotel_code, city) AS avg_price,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY hotel_code, city ORDER BY scraped_at_utc DESC
+                               ) AS rn
+                        FROM hotel_rates h
+                    ) t
+                    WHERE rn = 1
+                    ORDER BY hotel_code ASC, city ASC
+                    """
                 ),
                 conn,
+                parse_dates=["scraped_at_utc"],
             )
-        return df
-    except Exception:
+        return _tighten_dtypes(df.drop(columns="rn"), HOTEL_CATEGORIES)
+    except DBAPIError as e:
+        if not _is_missing_schema(e):
+            raise
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=60)
-def load_rental_data() -> pd.DataFrame:
+@st.cache_resource(ttl=3600)
+def load_rental_snapshot(latest_ts) -> pd.DataFrame:
     engine = get_engine()
     try:
         with engine.connect() as conn:
             df = pd.read_sql(
                 text(
-                    "SELECT * FROM rental_car_prices "
-                    "ORDER BY scraped_at_utc ASC, rental_code ASC"
+                    """
+                    SELECT * FROM (
+                        SELECT r.*,
+                               MIN(price) OVER (PARTITION BY rental_code) AS min_price,
+                               MAX(price) OVER (PARTITION BY rental_code) AS max_price,
+                               AVG(price) OVER (PARTITION BY rental_code) AS avg_price,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY rental_code ORDER BY scraped_at_utc DESC
+                               ) AS rn
+                        FROM rental_car_prices r
+                    ) t
+                    WHERE rn = 1
+                    ORDER BY rental_code ASC
+                    """
                 ),
                 conn,
+                parse_dates=["scraped_at_utc"],
             )
-        return df
-    except Exception:
+        return _tighten_dtypes(df.drop(columns="rn"), RENTAL_CATEGORIES)
+    except DBAPIError as e:
+        if not _is_missing_schema(e):
+            raise
         return pd.DataFrame()
 
 
+# Cheapest row per kind; load_cheapest_snapshot UNIONs these together.
+# Rentals only consider the latest valid scrape of each rental_code.
+_CHEAPEST_QUERIES = {
+    "flight": """
+        (SELECT 'flight' AS kind, route_code AS code,
+                route_name AS name, NULL AS city,
+                NULL AS pickup_city, NULL AS dropoff_city,
+                travel_date, price, currency
+         FROM flight_prices
+         WHERE price IS NOT NULL
+         ORDER BY price ASC LIMIT 1)
+    """,
+    "hotel": """
+        (SELECT 'hotel' AS kind, hotel_code AS code,
+                hotel_name AS name, city,
+                NULL AS pickup_city, NULL AS dropoff_city,
+                checkin_date AS travel_date, price, currency
+         FROM hotel_rates
+         WHERE price IS NOT NULL
+         ORDER BY price ASC LIMIT 1)
+    """,
+    "rental": """
+        (SELECT 'rental' AS kind, r.rental_code AS code,
+                r.route_name AS name, NULL AS city,
+                r.pickup_city, r.dropoff_city, r.travel_date,
+                r.price, r.currency
+         FROM rental_car_prices r
+         JOIN (
+             SELECT rental_code, MAX(scraped_at_utc) AS latest_ts
+             FROM rental_car_prices
+             WHERE price IS NOT NULL
+             GROUP BY rental_code
+         ) l
+           ON r.rental_code = l.rental_code
+          AND r.scraped_at_utc = l.latest_ts
+         WHERE r.price IS NOT NULL
+         ORDER BY r.price ASC LIMIT 1)
+    """,
+}
+
+
+@st.cache_resource(ttl=3600)
+def load_cheapest_snapshot(flights_ts, hotels_ts, rentals_ts) -> pd.DataFrame:
+    """
+    One row per kind ('flight', 'hotel', 'rental') holding the cheapest
+    price, fetched in a single UNION ALL round trip. If that fails, each
+    kind is queried on its own so one broken table only blanks its own card.
+    """
+    engine = get_engine()
+    with engine.connect() as conn:
+        try:
+            df = pd.read_sql(
+                text(" UNION ALL ".join(_CHEAPEST_QUERIES.values())), conn
+            )
+            return _tighten_dtypes(df, [])
+        except Exception:
+            conn.rollback()
+
+        frames = []
+        for kind, query in _CHEAPEST_QUERIES.items():
+            try:
+                frames.append(pd.read_sql(text(query), conn))
+            except Exception as e:
+                conn.rollback()
+                st.warning(f"Could not load the cheapest {kind} price: {e}")
+    if not frames:
+        return pd.DataFrame()
+    return _tighten_dtypes(pd.concat(frames, ignore_index=True), [])
+
+
+def _cheapest_row(cheapest: pd.DataFrame, kind: str):
+    if cheapest.empty:
+        return None
+    rows = cheapest[cheapest["kind"] == kind]
+    return None if rows.empty else rows.iloc[0]
+
+
 # ---------- Flight helpers ----------
 
 
+def _text(values: pd.Series) -> pd.Series:
+    # Stringify via NumPy so missing prices render as "nan"/"None" like the
+    # old f-strings did (pandas 3's astype(str) keeps NaN, which breaks the
+    # "\n".join below) and float32 prices keep their short repr.
+    return pd.Series(
+        values.to_numpy().astype(str), index=values.index, dtype=object
+    )
+
+
+def _str(df: pd.DataFrame, col: str) -> pd.Series:
+    return _text(df[col])
+
+
+def _price_stats(df: pd.DataFrame) -> pd.Series:
+    return (
+        "latest=" + _str(df, "price")
+        + ", min=" + _str(df, "min_price")
+        + ", max=" + _str(df, "max_price")
+        + ", avg=" + _text(df["avg_price"].round(2))
+    )
+
+
 def build_flight_summary(df: pd.DataFrame) -> str:
-    df = df.copy()
-    df["scraped_at_utc"] = pd.to_datetime(df["scraped_at_utc"])
-    lines = []
-    for (route, tdate), group in df.groupby(["route_code", "travel_date"]):
-        latest = group.sort_values("scraped_at_utc").iloc[-1]
-        min_price = group["price"].min()
-        max_price = group["price"].max()
-        avg_price = group["price"].mean()
-        lines.append(
-            f"Route {route} ({latest['route_name']}) on {tdate} via {latest['provider_name']} "
-            f"in {latest['currency']}: latest={latest['price']}, "
-            f"min={min_price}, max={max_price}, avg={avg_price:.2f}."
-        )
+    lines = (
+        "Route " + _str(df, "route_code")
+        + " (" + _str(df, "route_name") + ") on " + _str(df, "travel_date")
+        + " via " + _str(df, "provider_name")
+        + " in " + _str(df, "currency") + ": "
+        + _price_stats(df) + "."
+    )
     return "\n".join(lines)
 
 
-def get_cheapest_route(df: pd.DataFrame) -> str:
-    df_valid = df.dropna(subset=["price"]).copy()
-    if df_valid.empty:
+def get_cheapest_route(cheapest: pd.DataFrame) -> str:
+    row = _cheapest_row(cheapest, "flight")
+    if row is None:
         return "No valid flight prices yet."
-    row = df_valid.sort_values("price").iloc[0]
     return (
-        f"{row['route_code']} ({row['route_name']}) — "
+        f"{row['code']} ({row['name']}) — "
         f"{row['price']} {row['currency']} for {row['travel_date']}."
     )
 
@@ -92,13 +310,12 @@ def get_cheapest_route(df: pd.DataFrame) -> str:
 # ---------- Hotel helpers ----------
 
 
-def get_cheapest_hotel(df: pd.DataFrame) -> str:
-    df_valid = df.dropna(subset=["price"]).copy()
-    if df_valid.empty:
+def get_cheapest_hotel(cheapest: pd.DataFrame) -> str:
+    row = _cheapest_row(cheapest, "hotel")
+    if row is None:
         return "No valid hotel prices yet."
-    row = df_valid.sort_values("price").iloc[0]
     return (
-        f"{row['hotel_name']} ({row['hotel_code']}) in {row['city']} — "
+        f"{row['name']} ({row['code']}) in {row['city']} — "
         f"{row['price']} {row['currency']} starting price."
     )
 
@@ -106,23 +323,12 @@ def get_cheapest_hotel(df: pd.DataFrame) -> str:
 # ---------- Rental car helpers ----------
 
 
-def get_cheapest_rental_car(df: pd.DataFrame) -> str:
-    df_valid = df.dropna(subset=["price"]).copy()
-    if df_valid.empty:
+def get_cheapest_rental_car(cheapest: pd.DataFrame) -> str:
+    row = _cheapest_row(cheapest, "rental")
+    if row is None:
         return "No valid rental car prices yet."
-    if "scraped_at_utc" in df_valid.columns:
-        df_valid["scraped_at_utc"] = pd.to_datetime(df_valid["scraped_at_utc"])
-        latest = (
-            df_valid.sort_values("scraped_at_utc")
-            .groupby("rental_code")
-            .tail(1)
-        )
-    else:
-        latest = df_valid
-
-    row = latest.sort_values("price").iloc[0]
     return (
-        f"{row['rental_code']} ({row['route_name']}) — "
+        f"{row['code']} ({row['name']}) — "
         f"{row['price']} {row['currency']} from {row['pickup_city']} to {row['dropoff_city']}."
     )
 
@@ -130,98 +336,102 @@ def get_cheapest_rental_car(df: pd.DataFrame) -> str:
 # ---------- LLM QA ----------
 
 
+# "cheapest/lowest <kind>" or "<kind> ... cheapest/lowest", in one scan.
+_INTENT_RE = re.compile(
+    r"(?:cheapest|lowest).*?(?P<kind>rental|flight|route|hotel)"
+    r"|(?P<kind2>rental|flight|route|hotel).*?(?:cheapest|lowest)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
 def build_global_summary(
-    df_flights: pd.DataFrame, df_hotels: pd.DataFrame, df_rentals: pd.DataFrame
+    flight_snapshot: pd.DataFrame,
+    hotel_snapshot: pd.DataFrame,
+    rental_snapshot: pd.DataFrame,
 ) -> str:
     parts = []
 
-    if not df_flights.empty:
-        parts.append("FLIGHTS:\n" + build_flight_summary(df_flights))
-
-    if not df_hotels.empty:
-        dfh = df_hotels.copy()
-        dfh["scraped_at_utc"] = pd.to_datetime(dfh["scraped_at_utc"])
-        lines = []
-        for (code, city), group in dfh.groupby(["hotel_code", "city"]):
-            latest = group.sort_values("scraped_at_utc").iloc[-1]
-            min_price = group["price"].min()
-            max_price = group["price"].max()
-            avg_price = group["price"].mean()
-            lines.append(
-                f"Hotel bucket {latest['hotel_name']} ({code}) in {city}: "
-                f"latest={latest['price']}, min={min_price}, "
-                f"max={max_price}, avg={avg_price:.2f} {latest['currency']}."
-            )
+    if not flight_snapshot.empty:
+        parts.append("FLIGHTS:\n" + build_flight_summary(flight_snapshot))
+
+    if not hotel_snapshot.empty:
+        lines = (
+            "Hotel bucket " + _str(hotel_snapshot, "hotel_name")
+            + " (" + _str(hotel_snapshot, "hotel_code") + ") in "
+            + _str(hotel_snapshot, "city") + ": "
+            + _price_stats(hotel_snapshot) + " "
+            + _str(hotel_snapshot, "currency") + "."
+        )
         parts.append("HOTELS:\n" + "\n".join(lines))
 
-    if not df_rentals.empty:
-        dfr = df_rentals.copy()
-        if "scraped_at_utc" in dfr.columns:
-            dfr["scraped_at_utc"] = pd.to_datetime(dfr["scraped_at_utc"])
-        lines = []
-        for code, group in dfr.groupby("rental_code"):
-            latest = (
-                group.sort_values("scraped_at_utc").iloc[-1]
-                if "scraped_at_utc" in group.columns
-                else group.iloc[-1]
-            )
-            min_price = group["price"].min()
-            max_price = group["price"].max()
-            avg_price = group["price"].mean()
-            lines.append(
-                f"Rental {code} ({latest['route_name']}): "
-                f"latest={latest['price']}, min={min_price}, "
-                f"max={max_price}, avg={avg_price:.2f} {latest['currency']}."
-            )
+    if not rental_snapshot.empty:
+        lines = (
+            "Rental " + _str(rental_snapshot, "rental_code")
+            + " (" + _str(rental_snapshot, "route_name") + "): "
+            + _price_stats(rental_snapshot) + " "
+            + _str(rental_snapshot, "currency") + "."
+        )
         parts.append("RENTAL_CARS:\n" + "\n".join(lines))
 
     return "\n\n".join(parts)
 
 
-def answer_question(
-    question: str,
-    df_flights: pd.DataFrame,
-    df_hotels: pd.DataFrame,
-    df_rentals: pd.DataFrame,
-) -> str:
-    q_lower = question.lower()
-
-    if "rental" in q_lower and ("cheapest" in q_lower or "lowest" in q_lower):
-        return get_cheapest_rental_car(df_rentals)
-
-    if ("flight" in q_lower or "route" in q_lower) and (
-        "cheapest" in q_lower or "lowest" in q_lower
-    ):
-        return get_cheapest_route(df_flights)
-
-    if "hotel" in q_lower and ("cheapest" in q_lower or "lowest" in q_lower):
-        return get_cheapest_hotel(df_hotels)
-
-    if not OPENAI_API_KEY:
-        return (
-            "OPENAI_API_KEY is not configured. I cannot use the LLM for "
-            "free-form analysis, but you can still inspect the tables."
-        )
-
-    summary = build_global_summary(df_flights, df_hotels, df_rentals)
-
-    llm = ChatOpenAI(
+@st.cache_resource
+def get_llm() -> ChatOpenAI:
+    # One client per process keeps its HTTP connection pool warm.
+    return ChatOpenAI(
         model="gpt-4o-mini",
         temperature=0,
     )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def ask_llm(question: str, summary_digest: str, _summary: str) -> str:
+    """
+    Ask the LLM about the data summary. Cached on (question, summary_digest)
+    so repeating a question over unchanged data costs no tokens; the leading
+    underscore keeps Streamlit from hashing the full summary text.
+    """
     prompt = (
         "You are an assistant analyzing travel prices from flights, hotels, "
         "and rental cars. You will get a structured summary of the data and "
         "must answer the user's question using ONLY that information. "
         "If the data doesn't support an answer, say you don't know.\n\n"
-        f"Data summary:\n{summary}\n\n"
+        f"Data summary:\n{_summary}\n\n"
         f"User question: {question}\n\n"
         "Answer clearly and concisely."
     )
-    resp = llm.invoke(prompt)
+    resp = get_llm().invoke(prompt)
     return getattr(resp, "content", resp)
 
 
+def answer_question(
+    question: str,
+    cheapest: pd.DataFrame,
+    flight_snapshot: pd.DataFrame,
+    hotel_snapshot: pd.DataFrame,
+    rental_snapshot: pd.DataFrame,
+) -> str:
+    m = _INTENT_RE.search(question)
+    if m:
+        kind = (m.group("kind") or m.group("kind2")).lower()
+        if kind == "rental":
+            return get_cheapest_rental_car(cheapest)
+        if kind == "hotel":
+            return get_cheapest_hotel(cheapest)
+        return get_cheapest_route(cheapest)
+
+    if not OPENAI_API_KEY:
+        return (
+            "OPENAI_API_KEY is not configured. I cannot use the LLM for "
+            "free-form analysis, but you can still inspect the tables."
+        )
+
+    summary = build_global_summary(flight_snapshot, hotel_snapshot, rental_snapshot)
+    summary_digest = hashlib.blake2b(summary.encode(), digest_size=16).hexdigest()
+    return ask_llm(question, summary_digest, summary)
+
+
 # ---------- Streamlit main ----------
 
 
@@ -235,9 +445,15 @@ def main():
         "and rental cars in a Streamlit + LLM dashboard."
     )
 
-    df_flights = load_flight_data()
-    df_hotels = load_hotel_data()
-    df_rentals = load_rental_data()
+    flights_ts = latest_scrape_ts("flight_prices")
+    hotels_ts = latest_scrape_ts("hotel_rates")
+    rentals_ts = latest_scrape_ts("rental_car_prices")
+
+    flight_history = load_flight_history(flights_ts)
+    cheapest = load_cheapest_snapshot(flights_ts, hotels_ts, rentals_ts)
+    flight_snapshot = load_flight_snapshot(flights_ts)
+    hotel_snapshot = load_hotel_snapshot(hotels_ts)
+    rental_snapshot = load_rental_snapshot(rentals_ts)
 
     # ---------- Top banner: 3-way cheapest snapshot ----------
     st.subheader("🔥 Current Lowest Prices Snapshot")
@@ -246,15 +462,15 @@ def main():
 
     with col1:
         st.markdown("**Flights**")
-        st.write(get_cheapest_route(df_flights) if not df_flights.empty else "No data yet.")
+        st.write(get_cheapest_route(cheapest))
 
     with col2:
         st.markdown("**Hotels (OYO buckets)**")
-        st.write(get_cheapest_hotel(df_hotels) if not df_hotels.empty else "No data yet.")
+        st.write(get_cheapest_hotel(cheapest))
 
     with col3:
         st.markdown("**Rental Cars**")
-        st.write(get_cheapest_rental_car(df_rentals) if not df_rentals.empty else "No data yet.")
+        st.write(get_cheapest_rental_car(cheapest))
 
     st.markdown("---")
 
@@ -264,17 +480,12 @@ def main():
 
     # Flights tab
     with tab_flights:
-        if df_flights.empty:
+        if flight_snapshot.empty:
             st.warning("No flight data found yet. Run `python run_scraper.py` first.")
         else:
             st.subheader("Flight Prices (Latest Snapshot)")
-            latest = (
-                df_flights.sort_values("scraped_at_utc")
-                .groupby(["route_code", "provider_name", "travel_date"])
-                .tail(1)
-            )
             st.dataframe(
-                latest[
+                flight_snapshot[
                     [
                         "route_code",
                         "route_name",
@@ -290,11 +501,9 @@ def main():
             )
 
             st.subheader("Price History Over Time")
-            chart_df = df_flights[["scraped_at_utc", "route_code", "price"]].dropna()
-            if not chart_df.empty:
-                chart_df = chart_df.rename(columns={"scraped_at_utc": "time"})
+            if not flight_history.empty:
                 st.line_chart(
-                    chart_df,
+                    flight_history,
                     x="time",
                     y="price",
                     color="route_code",
@@ -304,17 +513,10 @@ def main():
 
     # Hotels tab
     with tab_hotels:
-        if df_hotels.empty:
+        if hotel_snapshot.empty:
             st.info("No hotel data found yet.")
         else:
             st.subheader("Hotel Buckets (Latest Snapshot)")
-            dfh = df_hotels.copy()
-            dfh["scraped_at_utc"] = pd.to_datetime(dfh["scraped_at_utc"])
-            latest_h = (
-                dfh.sort_values("scraped_at_utc")
-                .groupby(["hotel_code", "city"])
-                .tail(1)
-            )
             cols = [
                 "hotel_code",
                 "hotel_name",
@@ -326,28 +528,15 @@ def main():
                 "scraped_at_utc",
                 "url",
             ]
-            cols = [c for c in cols if c in latest_h.columns]
-            st.dataframe(latest_h[cols].reset_index(drop=True))
+            cols = [c for c in cols if c in hotel_snapshot.columns]
+            st.dataframe(hotel_snapshot[cols].reset_index(drop=True))
 
     # Rentals tab
     with tab_rentals:
-        if df_rentals.empty:
+        if rental_snapshot.empty:
             st.info("No rental car data found yet.")
         else:
             st.subheader("Rental Cars Prices (Latest Snapshot)")
-            dfr = df_rentals.copy()
-            if "scraped_at_utc" in dfr.columns:
-                dfr["scraped_at_utc"] = pd.to_datetime(dfr["scraped_at_utc"])
-
-            if "scraped_at_utc" in dfr.columns:
-                latest_r = (
-                    dfr.sort_values("scraped_at_utc")
-                    .groupby("rental_code")
-                    .tail(1)
-                )
-            else:
-                latest_r = dfr
-
             cols = [
                 "rental_code",
                 "pickup_city",
@@ -361,8 +550,8 @@ def main():
                 "scraped_at_utc",
                 "url",
             ]
-            cols = [c for c in cols if c in latest_r.columns]
-            st.dataframe(latest_r[cols].reset_index(drop=True))
+            cols = [c for c in cols if c in rental_snapshot.columns]
+            st.dataframe(rental_snapshot[cols].reset_index(drop=True))
 
     # Assistant tab
     with tab_assistant:
@@ -382,7 +571,11 @@ def main():
             else:
                 with st.spinner("Thinking..."):
                     answer = answer_question(
-                        user_q, df_flights, df_hotels, df_rentals
+                        user_q,
+                        cheapest,
+                        flight_snapshot,
+                        hotel_snapshot,
+                        rental_snapshot,
                     )
                 st.markdown("**Answer:**")
                 st.write(answer)
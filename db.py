@@ -1,16 +1,37 @@
 # db.py
+import logging
+from functools import lru_cache
+
 from sqlalchemy import create_engine, text
 from config import SINGLESTORE_URI
 
+log = logging.getLogger("db")
+
 
+@lru_cache(maxsize=1)
 def get_engine():
+    """
+    Return the process-wide SQLAlchemy engine. The engine owns the
+    connection pool, so building it once keeps connections warm across
+    dashboard reruns instead of reconnecting every time.
+    """
+    if not SINGLESTORE_URI:
+        raise ValueError("SINGLESTORE_URI is not set in .env")
     return create_engine(SINGLESTORE_URI, pool_pre_ping=True)
 
 
-def create_tables_if_not_exists():
+# Bump whenever create_tables_if_not_exists() gains a new migration.
+SCHEMA_VERSION = 3
+
+
+def create_tables_if_not_exists(engine):
     """
     Create tables for flights, hotels, and rental cars in SingleStore if they don't exist.
-    Also ensure newer columns (like route_name and travel_date for rentals) exist via ALTER TABLE.
+    Also ensure newer columns (like route_name and travel_date for rentals) exist via ALTER TABLE,
+    and add the per-group time indexes used by the dashboard.
+
+    The applied version is recorded in schema_migrations, so once the schema
+    is current every later run skips the DDL after a single lookup.
     """
     ddl_flights = """
     CREATE TABLE IF NOT EXISTS flight_prices (
@@ -64,8 +85,22 @@ def create_tables_if_not_exists():
     );
     """
 
-    engine = get_engine()
     with engine.connect() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INT PRIMARY KEY
+                );
+                """
+            )
+        )
+        current_version = conn.execute(
+            text("SELECT MAX(version) FROM schema_migrations")
+        ).scalar()
+        if current_version is not None and current_version >= SCHEMA_VERSION:
+            return
+
         # Create base tables if missing (no-op if already there)
         conn.execute(text(ddl_flights))
         conn.execute(text(ddl_hotels))
@@ -100,134 +135,139 @@ def create_tables_if_not_exists():
             if "Duplicate column name" not in str(e):
                 raise
 
+        # ---- Migration 3: indexes for the dashboard's "latest per group" ----
+        # Match the GROUP BY keys of the dashboard snapshot queries so
+        # MAX(scraped_at_utc) per group is an index range scan.
+        index_ddls = [
+            """
+            ALTER TABLE flight_prices
+            ADD INDEX ix_flight_route_time (route_code, travel_date, scraped_at_utc);
+            """,
+            """
+            ALTER TABLE hotel_rates
+            ADD INDEX ix_hotel_code_time (hotel_code, city, scraped_at_utc);
+            """,
+            """
+            ALTER TABLE rental_car_prices
+            ADD INDEX ix_rental_code_time (rental_code, scraped_at_utc);
+            """,
+        ]
+        # The indexes are only a speed-up and may be rejected outright
+        # (e.g. columnstore tables on SingleStore Helios only take
+        # USING HASH keys), so a failure is logged once and the schema
+        # version is still recorded instead of retrying on every run.
+        for ddl_index in index_ddls:
+            try:
+                conn.execute(text(ddl_index))
+            except Exception as e:
+                if "Duplicate key name" not in str(e):
+                    log.warning("Could not add dashboard index, skipping it: %s", e)
+
+        conn.execute(
+            text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+            {"version": SCHEMA_VERSION},
+        )
         conn.commit()
 
 
-def insert_flight_prices(engine, rows):
+# Rows per multi-VALUES INSERT statement.
+INSERT_CHUNK_SIZE = 500
+
+_FLIGHT_COLUMNS = (
+    "route_code",
+    "origin",
+    "destination",
+    "route_name",
+    "provider_name",
+    "currency",
+    "price",
+    "price_raw",
+    "url",
+    "travel_date",
+    "scraped_at_utc",
+)
+
+_HOTEL_COLUMNS = (
+    "hotel_code",
+    "city",
+    "hotel_name",
+    "provider_name",
+    "currency",
+    "price",
+    "price_raw",
+    "url",
+    "checkin_date",
+    "checkout_date",
+    "scraped_at_utc",
+)
+
+_RENTAL_COLUMNS = (
+    "rental_code",
+    "pickup_city",
+    "dropoff_city",
+    "pickup_date",
+    "dropoff_date",
+    "route_name",
+    "provider_name",
+    "currency",
+    "price",
+    "price_raw",
+    "url",
+    "travel_date",
+    "scraped_at_utc",
+)
+
+
+def _insert_rows(conn, table, columns, rows):
     """
-    Insert a list of rows into flight_prices.
-    Each row is a dict with fields matching the INSERT below.
+    Insert rows using one multi-row INSERT ... VALUES (...), (...) per
+    INSERT_CHUNK_SIZE rows, so a whole scrape costs a single round trip
+    per chunk instead of one per row.
     """
-    if not rows:
-        return
+    column_list = ", ".join(columns)
 
-    insert_sql = text(
-        """
-        INSERT INTO flight_prices (
-            route_code,
-            origin,
-            destination,
-            route_name,
-            provider_name,
-            currency,
-            price,
-            price_raw,
-            url,
-            travel_date,
-            scraped_at_utc
-        ) VALUES (
-            :route_code,
-            :origin,
-            :destination,
-            :route_name,
-            :provider_name,
-            :currency,
-            :price,
-            :price_raw,
-            :url,
-            :travel_date,
-            :scraped_at_utc
-        )
-        """
-    )
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        values = []
+        params = {}
+        for i, row in enumerate(chunk):
+            values.append(
+                "(" + ", ".join(f":{col}_{i}" for col in columns) + ")"
+            )
+            for col in columns:
+                params[f"{col}_{i}"] = row[col]
 
-    with engine.begin() as conn:
-        conn.execute(insert_sql, rows)
+        insert_sql = text(
+            f"INSERT INTO {table} ({column_list}) VALUES {', '.join(values)}"
+        )
+        conn.execute(insert_sql, params)
 
 
-def insert_hotel_rates(engine, rows):
+def insert_flight_prices(conn, rows):
     """
-    Insert a list of rows into hotel_rates.
-    Each row is a dict with fields matching the INSERT below.
+    Insert a list of rows into flight_prices on an open connection/transaction.
+    Each row is a dict keyed by the columns in _FLIGHT_COLUMNS.
     """
     if not rows:
         return
+    _insert_rows(conn, "flight_prices", _FLIGHT_COLUMNS, rows)
 
-    insert_sql = text(
-        """
-        INSERT INTO hotel_rates (
-            hotel_code,
-            city,
-            hotel_name,
-            provider_name,
-            currency,
-            price,
-            price_raw,
-            url,
-            checkin_date,
-            checkout_date,
-            scraped_at_utc
-        ) VALUES (
-            :hotel_code,
-            :city,
-            :hotel_name,
-            :provider_name,
-            :currency,
-            :price,
-            :price_raw,
-            :url,
-            :checkin_date,
-            :checkout_date,
-            :scraped_at_utc
-        )
-        """
-    )
 
-    with engine.begin() as conn:
-        conn.execute(insert_sql, rows)
-
-
-def insert_rental_car_prices(engine, rows):
+def insert_hotel_rates(conn, rows):
     """
-    Insert a list of rows into rental_car_prices.
-    Each row is a dict with fields matching the INSERT below.
+    Insert a list of rows into hotel_rates on an open connection/transaction.
+    Each row is a dict keyed by the columns in _HOTEL_COLUMNS.
     """
     if not rows:
         return
+    _insert_rows(conn, "hotel_rates", _HOTEL_COLUMNS, rows)
 
-    insert_sql = text(
-        """
-        INSERT INTO rental_car_prices (
-            rental_code,
-            pickup_city,
-            dropoff_city,
-            pickup_date,
-            dropoff_date,
-            route_name,
-            provider_name,
-            currency,
-            price,
-            price_raw,
-            url,
-            travel_date,
-            scraped_at_utc
-        ) VALUES (
-            :rental_code,
-            :pickup_city,
-            :dropoff_city,
-            :pickup_date,
-            :dropoff_date,
-            :route_name,
-            :provider_name,
-            :currency,
-            :price,
-            :price_raw,
-            :url,
-            :travel_date,
-            :scraped_at_utc
-        )
-        """
-    )
 
-    with engine.begin() as conn:
-        conn.execute(insert_sql, rows)
\ No newline at end of file
+def insert_rental_car_prices(conn, rows):
+    """
+    Insert a list of rows into rental_car_prices on an open connection/transaction.
+    Each row is a dict keyed by the columns in _RENTAL_COLUMNS.
+    """
+    if not rows:
+        return
+    _insert_rows(conn, "rental_car_prices", _RENTAL_COLUMNS, rows)
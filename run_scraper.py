@@ -1,5 +1,10 @@
 import datetime
+import logging
+import sys
+from dataclasses import asdict
 from datetime import timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
 
 from db import (
     get_engine,
@@ -8,96 +13,87 @@ from db import (
     insert_hotel_rates,
     insert_rental_car_prices,
 )
-from scraper import (
-    scrape_flight_prices,
-    scrape_hotel_rates,
-    scrape_rental_car_prices,
-)
+from scraper import mark_scraped, scrape_all
 from config import TRAVEL_DATE_STR
 
+log = logging.getLogger("run_scraper")
+
+
+def _start_logging():
+    """
+    Send every log record through a queue to a single stdout handler, so
+    the concurrent fetch workers only enqueue records instead of contending
+    on stdout. Returns the listener; stop() it to flush on exit.
+    """
+    queue = Queue(-1)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(queue))
+    root.setLevel(logging.INFO)
+    # httpx/httpcore log every request at INFO; keep only their warnings.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
+
+    listener = QueueListener(queue, handler)
+    listener.start()
+    return listener
+
+
+def _stamp(rows, scraped_at):
+    """
+    Scrapers return row dataclasses whose fields match the INSERT
+    placeholders, so only the shared run timestamp needs to be set, and
+    rows become dicts only here at the DB boundary.
+    """
+    records = []
+    for row in rows:
+        row.scraped_at_utc = scraped_at
+        records.append(asdict(row))
+    return records
+
 
 def main():
-    print("=== Thordata-Powered Travel Price Scraper ===")
-    print(f"[INFO] Target travel date label: {TRAVEL_DATE_STR}")
+    listener = _start_logging()
+    try:
+        _run()
+    finally:
+        listener.stop()
 
-    # Ensure all tables exist
-    create_tables_if_not_exists()
+
+def _run():
+    log.info("=== Thordata-Powered Travel Price Scraper ===")
+    log.info("Target travel date label: %s", TRAVEL_DATE_STR)
 
     engine = get_engine()
+
+    # Ensure all tables exist
+    create_tables_if_not_exists(engine)
+
     scraped_at = datetime.datetime.now(timezone.utc)
 
-    # -------- Flights --------
-    flight_rows = scrape_flight_prices()
-    rows_for_db = []
-    for r in flight_rows:
-        rows_for_db.append(
-            {
-                "route_code": r["route_code"],
-                "origin": r["origin"],
-                "destination": r["destination"],
-                "route_name": r["route_name"],
-                "provider_name": r["provider_name"],
-                "currency": r["currency"],
-                "price": r["price"],
-                "price_raw": r["price_raw"],
-                "url": r["url"],
-                "travel_date": r.get("travel_date"),
-                "scraped_at_utc": scraped_at,
-            }
-        )
-
-    insert_flight_prices(engine, rows_for_db)
-    print(f"[OK] Inserted {len(rows_for_db)} flight rows into flight_prices.")
-
-    # -------- Hotels (OYO buckets) --------
-    hotel_rows = scrape_hotel_rates()
-    hotel_rows_for_db = []
-    for h in hotel_rows:
-        hotel_rows_for_db.append(
-            {
-                "hotel_code": h["hotel_code"],
-                "city": h["city"],
-                "hotel_name": h["hotel_name"],
-                "provider_name": h["provider_name"],
-                "currency": h["currency"],
-                "price": h["price"],
-                "price_raw": h["price_raw"],
-                "url": h["url"],
-                "checkin_date": h.get("checkin_date"),
-                "checkout_date": h.get("checkout_date"),
-                "scraped_at_utc": scraped_at,
-            }
-        )
-
-    insert_hotel_rates(engine, hotel_rows_for_db)
-    print(f"[OK] Inserted {len(hotel_rows_for_db)} hotel rows into hotel_rates.")
-
-    # -------- Rental cars (Gozo) --------
-    rental_rows = scrape_rental_car_prices()
-    rental_rows_for_db = []
-    for r in rental_rows:
-        rental_rows_for_db.append(
-            {
-                "rental_code": r["rental_code"],
-                "pickup_city": r["pickup_city"],
-                "dropoff_city": r["dropoff_city"],
-                "pickup_date": TRAVEL_DATE_STR,  # or keep None if you prefer
-                "dropoff_date": None,
-                "route_name": r["route_name"],
-                "provider_name": r["provider_name"],
-                "currency": r["currency"],
-                "price": r["price"],
-                "price_raw": r["price_raw"],
-                "url": r["url"],
-                "travel_date": r.get("travel_date"),
-                "scraped_at_utc": scraped_at,
-            }
-        )
-
-    insert_rental_car_prices(engine, rental_rows_for_db)
-    print(f"[OK] Inserted {len(rental_rows_for_db)} rental rows into rental_car_prices.")
-
-    print("\n[DONE] Scraping + ingestion complete.")
+    # Flights, hotels and rentals are scraped concurrently.
+    flight_rows, hotel_rows, rental_rows = scrape_all()
+    flight_records = _stamp(flight_rows, scraped_at)
+    hotel_records = _stamp(hotel_rows, scraped_at)
+    rental_records = _stamp(rental_rows, scraped_at)
+
+    # One transaction for the whole run keeps the snapshot atomic and
+    # costs a single commit.
+    with engine.begin() as conn:
+        insert_flight_prices(conn, flight_records)
+        insert_hotel_rates(conn, hotel_records)
+        insert_rental_car_prices(conn, rental_records)
+
+    # Checkpoint only once the rows are committed to SingleStore.
+    mark_scraped(flight_rows + hotel_rows + rental_rows)
+
+    log.info("Inserted %d flight rows into flight_prices.", len(flight_rows))
+    log.info("Inserted %d hotel rows into hotel_rates.", len(hotel_rows))
+    log.info("Inserted %d rental rows into rental_car_prices.", len(rental_rows))
+
+    log.info("Scraping + ingestion complete.")
 
 
 if __name__ == "__main__":
@@ -1,18 +1,33 @@
 # scraper.py
 
-import time
+import asyncio
+import itertools
+import logging
 import random
+import threading
+import time
 import re
 import datetime
-from typing import List, Dict, Any
-from urllib.parse import urlencode
-
-import requests
+import sqlite3
+from dataclasses import dataclass
+from html import unescape
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
 from bs4 import BeautifulSoup
-from requests.exceptions import RequestException
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # optional: fall back to BeautifulSoup
+    HTMLParser = None
 
 from config import (
     get_proxy_dict,
+    RESPECT_ROBOTS,
+    CHECKPOINT_PATH,
+    REFRESH_SECS,
     FLIGHT_ROUTES,
     HOTEL_STAYS,
     RENTAL_CAR_OFFERS,
@@ -21,6 +36,8 @@ from config import (
     TRAVEL_DATE_STR,
 )
 
+log = logging.getLogger("scraper")
+
 # A couple of realistic desktop headers to rotate
 HEADERS_LIST = [
     {
@@ -41,30 +58,456 @@ HEADERS_LIST = [
     },
 ]
 
+# Rotate through HEADERS_LIST round-robin; the lock keeps next() safe
+# across the fetch worker threads.
+_HEADER_CYCLE = itertools.cycle(HEADERS_LIST)
+_HEADER_LOCK = threading.Lock()
+
+
+def _next_headers() -> Dict[str, str]:
+    with _HEADER_LOCK:
+        return next(_HEADER_CYCLE)
+
+
+# Transient statuses retried with exponential backoff (honouring
+# Retry-After); the last response still goes to raise_for_status.
+# A Retry-After longer than MAX_RETRY_AFTER gives up on the URL instead,
+# since the wait would hold a fetch slot and stall the whole phase.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_RETRY_AFTER = 60.0
+
+
+# Built on first use; the lock stops concurrent first fetches from each
+# building (and leaking) their own client.
+_CLIENT: Optional[httpx.Client] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """
+    Return the shared HTTP/2 client. Skyscanner/OYO/Gozo pages share a
+    handful of hosts, so requests to one host are multiplexed over a single
+    proxied TLS connection instead of opening a tunnel per fetch.
+    Connection failures are retried by the transport.
+    """
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            transport = httpx.HTTPTransport(
+                http2=True,
+                proxy=get_proxy_dict().get("https"),
+                retries=MAX_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=20, max_keepalive_connections=10
+                ),
+            )
+            _CLIENT = httpx.Client(transport=transport, follow_redirects=True)
+    return _CLIENT
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying, or None if resp should not be retried.
+    """
+    if resp.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+        return None
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = float(retry_after)
+        return delay if delay <= MAX_RETRY_AFTER else None
+    return BACKOFF_FACTOR * (2 ** attempt)
+
 
-def fetch_page(url: str, timeout: int = 40) -> str:
+# Minimum gap (seconds) between two requests to the same host, shared by
+# all fetch workers so concurrency never bursts a single site.
+MIN_HOST_INTERVAL = 1.5
+
+_LAST_FETCH: Dict[str, float] = {}
+_LAST_FETCH_LOCK = threading.Lock()
+
+
+def _wait_for_host_slot(host: str) -> None:
     """
-    Fetch an HTML page via Thordata residential proxy.
+    Reserve the next request slot for host and sleep until it arrives,
+    at least MIN_HOST_INTERVAL after the previously reserved one.
     """
-    proxies = get_proxy_dict()
-    headers = random.choice(HEADERS_LIST)
+    with _LAST_FETCH_LOCK:
+        now = time.monotonic()
+        slot = max(now, _LAST_FETCH.get(host, 0.0) + MIN_HOST_INTERVAL)
+        _LAST_FETCH[host] = slot
+    if slot > now:
+        time.sleep(slot - now)
+
 
-    resp = requests.get(
-        url,
-        headers=headers,
-        proxies=proxies,
-        timeout=timeout,
+# Parsed robots.txt per origin. Each origin has its own lock so workers that
+# start together wait for one fetch instead of all downloading it.
+_ROBOTS: Dict[str, RobotFileParser] = {}
+_ROBOTS_LOCKS: Dict[str, threading.Lock] = {}
+_ROBOTS_LOCKS_LOCK = threading.Lock()
+
+
+def _robots_for(origin: str) -> RobotFileParser:
+    """
+    Return the parsed robots.txt for origin, fetching it once per host.
+    """
+    robots = _ROBOTS.get(origin)
+    if robots is not None:
+        return robots
+
+    with _ROBOTS_LOCKS_LOCK:
+        origin_lock = _ROBOTS_LOCKS.setdefault(origin, threading.Lock())
+    with origin_lock:
+        robots = _ROBOTS.get(origin)
+        if robots is None:
+            robots = _load_robots(origin)
+            _ROBOTS[origin] = robots
+    return robots
+
+
+def _load_robots(origin: str) -> RobotFileParser:
+    """
+    Fetch and parse <origin>/robots.txt. Like the stdlib reader, 401/403
+    disallow everything and other failures allow everything.
+    """
+    robots = RobotFileParser()
+    try:
+        _wait_for_host_slot(urlsplit(origin).netloc)
+        resp = _get_client().get(
+            f"{origin}/robots.txt", headers=_next_headers(), timeout=20
+        )
+    except httpx.HTTPError:
+        robots.allow_all = True
+        return robots
+
+    if resp.status_code in (401, 403):
+        robots.disallow_all = True
+    elif resp.status_code >= 400:
+        robots.allow_all = True
+    else:
+        robots.parse(resp.text.splitlines())
+    return robots
+
+
+def fetch_page(
+    url: str, timeout: int = 40, stop_after_prices: Optional[int] = None
+) -> str:
+    """
+    Fetch an HTML page via Thordata residential proxy, after checking the
+    host's robots.txt and waiting for its MIN_HOST_INTERVAL slot.
+
+    If stop_after_prices is set, the body is streamed and the download is
+    abandoned once that many '₹' signs have arrived – for parsers that only
+    look at the first few prices on a page.
+    """
+    client = _get_client()
+    headers = _next_headers()
+
+    parts = urlsplit(url)
+    if RESPECT_ROBOTS:
+        robots = _robots_for(f"{parts.scheme}://{parts.netloc}")
+        if not robots.can_fetch(headers["User-Agent"], url):
+            raise httpx.HTTPError(f"Disallowed by robots.txt: {url}")
+
+    for attempt in range(MAX_RETRIES + 1):
+        _wait_for_host_slot(parts.netloc)
+        with client.stream("GET", url, headers=headers, timeout=timeout) as resp:
+            delay = _retry_delay(resp, attempt)
+            if delay is None:
+                resp.raise_for_status()
+                return _read_text(resp, stop_after_prices)
+        time.sleep(delay)
+
+
+def _read_text(resp: httpx.Response, stop_after_prices: Optional[int]) -> str:
+    if stop_after_prices is None:
+        resp.read()
+        return resp.text
+
+    chunks: List[str] = []
+    seen = 0
+    for chunk in resp.iter_text():
+        chunks.append(chunk)
+        seen += chunk.count("₹")
+        if seen >= stop_after_prices:
+            break
+    return "".join(chunks)
+
+
+# Pages fetched at once per scrape phase
+MAX_CONCURRENT_FETCHES = 5
+
+
+async def _fetch_page_async(
+    url: str,
+    sem: asyncio.Semaphore,
+    timeout: int = 40,
+    pause: Tuple[float, float] = (1.0, 2.0),
+    stop_after_prices: Optional[int] = None,
+) -> str:
+    """
+    Run the blocking fetch_page in a worker thread, at most
+    MAX_CONCURRENT_FETCHES at a time. Each slot stays held for a short
+    random pause after the fetch, so concurrency never turns into hammering.
+    """
+    async with sem:
+        try:
+            return await asyncio.to_thread(
+                fetch_page, url, timeout, stop_after_prices
+            )
+        finally:
+            # be polite, avoid hammering
+            await asyncio.sleep(random.uniform(*pause))
+
+
+# ---------------------------------------------------------------------------
+# Rows
+# ---------------------------------------------------------------------------
+# One slotted record per scraped item, fields named like the DB columns.
+# scraped_at_utc is filled in by run_scraper just before insertion.
+
+@dataclass(slots=True)
+class FlightRow:
+    route_code: str
+    origin: str
+    destination: str
+    route_name: str
+    provider_name: str
+    currency: str
+    price: Optional[float]
+    price_raw: str
+    url: str
+    travel_date: Optional[str]
+    scraped_at_utc: Optional[datetime.datetime] = None
+
+
+@dataclass(slots=True)
+class HotelRow:
+    hotel_code: str
+    city: str
+    hotel_name: str
+    provider_name: str
+    currency: str
+    price: Optional[float]
+    price_raw: str
+    url: str
+    checkin_date: str
+    checkout_date: str
+    scraped_at_utc: Optional[datetime.datetime] = None
+
+
+@dataclass(slots=True)
+class RentalRow:
+    rental_code: str
+    pickup_city: str
+    dropoff_city: str
+    pickup_date: Optional[str]
+    dropoff_date: Optional[str]
+    route_name: str
+    provider_name: str
+    currency: str
+    price: Optional[float]
+    price_raw: str
+    url: str
+    travel_date: Optional[str]
+    scraped_at_utc: Optional[datetime.datetime] = None
+
+
+Row = Union[FlightRow, HotelRow, RentalRow]
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint
+# ---------------------------------------------------------------------------
+
+def _open_checkpoint() -> sqlite3.Connection:
+    """
+    Open (creating if needed) the checkpoint database, which records when
+    each (code, date) item was last scraped successfully.
+    """
+    conn = sqlite3.connect(CHECKPOINT_PATH)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS checkpoint (
+            code TEXT NOT NULL,
+            date TEXT NOT NULL,
+            ts REAL NOT NULL,
+            PRIMARY KEY (code, date)
+        )
+        """
     )
-    resp.raise_for_status()
-    if not resp.encoding:
-        resp.encoding = "utf-8"
-    return resp.text
+    return conn
+
+
+def _recently_scraped(conn: sqlite3.Connection, code: str, date: str) -> bool:
+    found = conn.execute(
+        "SELECT ts FROM checkpoint WHERE code = ? AND date = ?", (code, date)
+    ).fetchone()
+    return found is not None and time.time() - found[0] < REFRESH_SECS
+
+
+# Checkpoint (code, date) fields for each row type
+_CHECKPOINT_KEYS = {
+    FlightRow: ("route_code", "travel_date"),
+    HotelRow: ("hotel_code", "checkin_date"),
+    RentalRow: ("rental_code", "travel_date"),
+}
+
+
+def mark_scraped(rows: List[Row]) -> None:
+    """
+    Record rows that produced a price in the checkpoint, in one commit.
+    Call only after the rows are safely stored, so a failed insert never
+    makes the next run skip them. No-op unless REFRESH_SECS is set.
+    """
+    if REFRESH_SECS <= 0:
+        return
+
+    now = time.time()
+    entries = []
+    for row in rows:
+        if row.price is None:
+            continue
+        code_key, date_key = _CHECKPOINT_KEYS[type(row)]
+        date = getattr(row, date_key) or ""
+        entries.append((getattr(row, code_key), date, now))
+
+    conn = _open_checkpoint()
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO checkpoint (code, date, ts) VALUES (?, ?, ?)",
+            entries,
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# Per-item scraper: (config entry, semaphore) -> row or None
+ItemScraper = Callable[
+    [Dict[str, Any], asyncio.Semaphore], Awaitable[Optional[Row]]
+]
+
+
+async def _scrape_phase(
+    items: Tuple[Dict[str, Any], ...],
+    scrape_item: ItemScraper,
+    code_key: str,
+    date_key: str,
+) -> List[Row]:
+    """
+    Scrape every item, up to MAX_CONCURRENT_FETCHES at a time. When
+    REFRESH_SECS is set, items checkpointed within that window are skipped
+    (see mark_scraped).
+    """
+    todo = list(items)
+    if REFRESH_SECS > 0:
+        conn = _open_checkpoint()
+        try:
+            todo = []
+            for item in items:
+                date = item.get(date_key) or ""
+                if _recently_scraped(conn, item[code_key], date):
+                    log.info(
+                        "Skipping %s – scraped within the last %ss",
+                        item[code_key], REFRESH_SECS,
+                    )
+                else:
+                    todo.append(item)
+        finally:
+            conn.close()
+
+    sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    rows = await asyncio.gather(*(scrape_item(item, sem) for item in todo))
+    return [row for row in rows if row is not None]
+
+
+# ---------------------------------------------------------------------------
+# Text extraction
+# ---------------------------------------------------------------------------
+
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_H1_RE = re.compile(r"<h1[^>]*>(.*?)</h1>", re.IGNORECASE | re.DOTALL)
+
+# OYO/Gozo prices sit near the top of the page; only this many characters
+# of extracted text are scanned, skipping footer/SEO blobs.
+MAX_TEXT_CHARS = 200_000
+
+# Price patterns shared by all parsers. Quantifiers are possessive, so a
+# "Cheapest deal" label with no ₹ after it fails in one scan instead of
+# backtracking over the rest of the page.
+_PRICE_RE = re.compile(r"₹\s*+([\d,]++)")
+# Every '₹ <number>', with group 1 set when it directly follows a
+# "Cheapest deal" label – lets Skyscanner parsing find both in one scan.
+_SKYSCANNER_PRICE_RE = re.compile(
+    r"(Cheapest deal[^₹]*+)?₹\s*+([\d,]++)", re.IGNORECASE
+)
+
+
+def _page_text(html: str) -> str:
+    """
+    Cheap stand-in for soup.get_text(" ", strip=True): drop <script>/<style>
+    blocks and tags with regexes, unescape entities, collapse whitespace.
+    No DOM is built.
+    """
+    text = _SCRIPT_STYLE_RE.sub(" ", html)
+    text = _TAG_RE.sub(" ", text)
+    return " ".join(unescape(text).split())
+
+
+def _dom_text(html: str) -> str:
+    """
+    Full DOM text extraction, used only as a fallback when the
+    regex-stripped text yields no price. Uses selectolax's C parser when
+    installed, BeautifulSoup otherwise.
+    """
+    if HTMLParser is None:
+        return BeautifulSoup(html, "lxml").get_text(" ", strip=True)
+
+    tree = HTMLParser(html)
+    tree.strip_tags(["script", "style"])
+    node = tree.body or tree.root
+    return node.text(separator=" ", strip=True) if node else ""
 
 
 # ---------------------------------------------------------------------------
 # Skyscanner (Flights)
 # ---------------------------------------------------------------------------
 
+def _extract_skyscanner_price(full_text: str) -> Tuple[Optional[float], str]:
+    # Single pass: return the first price tagged "Cheapest deal" right away,
+    # otherwise fall back to the minimum of all ₹ amounts seen. Only the
+    # first label counts: if its number doesn't parse, later labels are
+    # treated as plain prices.
+    min_value = None
+    use_label = True
+
+    for m in _SKYSCANNER_PRICE_RE.finditer(full_text):
+        numeric_str = m.group(2)
+        labelled = use_label and m.group(1) is not None
+        if labelled:
+            use_label = False
+        try:
+            value = int(numeric_str.replace(",", ""))
+        except ValueError:
+            continue
+
+        if labelled:
+            return float(value), f"₹ {numeric_str}"
+
+        if min_value is None or value < min_value:
+            min_value = value
+
+    if min_value is None:
+        return None, ""
+    return float(min_value), f"₹ {min_value:,}"
+
+
 def parse_skyscanner_page(html: str) -> Dict[str, Any]:
     """
     Parse a Skyscanner route page.
@@ -73,42 +516,17 @@ def parse_skyscanner_page(html: str) -> Dict[str, Any]:
       1. Look specifically for the 'Cheapest deal' text block and grab
          the first '₹ <number>' that appears near it.
       2. If that fails, fall back to 'min of all ₹ amounts' as backup.
-    """
-    soup = BeautifulSoup(html, "html.parser")
 
+    Text comes from _page_text(); BeautifulSoup is only used when that
+    yields no price at all.
+    """
     # Title from <h1>, if present
-    h1 = soup.find("h1")
-    title = h1.get_text(strip=True) if h1 else ""
-
-    full_text = soup.get_text(" ", strip=True)
-
-    # --- Step 1: try to extract price near "Cheapest deal" label ---
-    cheapest_price = None
-    cheapest_raw = ""
-
-    m = re.search(r"Cheapest deal[^₹]*₹\s*([\d,]+)", full_text, flags=re.IGNORECASE)
-    if m:
-        numeric_str = m.group(1)
-        try:
-            cheapest_price = float(numeric_str.replace(",", ""))
-            cheapest_raw = f"₹ {numeric_str}"
-        except ValueError:
-            cheapest_price = None
+    m = _H1_RE.search(html)
+    title = _page_text(m.group(1)) if m else ""
 
-    # --- Step 2: fallback – min of all ₹ amounts on page ---
+    cheapest_price, cheapest_raw = _extract_skyscanner_price(_page_text(html))
     if cheapest_price is None:
-        matches = re.findall(r"₹\s*([\d,]+)", full_text)
-        if matches:
-            values = []
-            for val in matches:
-                try:
-                    values.append(int(val.replace(",", "")))
-                except ValueError:
-                    continue
-            if values:
-                v = min(values)
-                cheapest_price = float(v)
-                cheapest_raw = f"₹ {v:,}"
+        cheapest_price, cheapest_raw = _extract_skyscanner_price(_dom_text(html))
 
     return {
         "page_title": title,
@@ -118,97 +536,164 @@ def parse_skyscanner_page(html: str) -> Dict[str, Any]:
     }
 
 
-def scrape_flight_prices() -> List[Dict[str, Any]]:
-    """
-    Scrape all configured flight routes from Skyscanner via Thordata.
-    Returns a list of dicts ready for DB insertion (without timestamp).
-    """
-    results: List[Dict[str, Any]] = []
+async def _scrape_flight_route(
+    route: Dict[str, Any], sem: asyncio.Semaphore
+) -> Optional[FlightRow]:
+    url = route["url"]
+    log.info(
+        "Scraping flight %s (%s) – %s – %s",
+        route["route_name"], route["route_code"], PROVIDER_NAME, url,
+    )
 
-    for route in FLIGHT_ROUTES:
-        url = route["url"]
-        print(
-            f"\n[INFO] Scraping flight {route['route_name']} "
-            f"({route['route_code']}) – {PROVIDER_NAME} – {url}"
+    try:
+        html = await _fetch_page_async(url, sem, pause=(1.0, 2.5))
+        parsed = parse_skyscanner_page(html)
+
+        if parsed["price"] is None:
+            log.warning(
+                "No price found on page for %s. "
+                "Check if Skyscanner changed the layout.",
+                route["route_code"],
+            )
+        else:
+            log.info(
+                "Cheapest visible flight price for %s: %s (%s)",
+                route["route_code"], parsed["price_raw"], parsed["price"],
+            )
+
+        return FlightRow(
+            route_code=route["route_code"],
+            origin=route["origin"],
+            destination=route["destination"],
+            route_name=route["route_name"],
+            provider_name=PROVIDER_NAME,
+            currency=parsed["currency"],
+            price=parsed["price"],
+            price_raw=parsed["price_raw"],
+            url=url,
+            travel_date=route.get("travel_date"),
         )
 
-        try:
-            html = fetch_page(url)
-            parsed = parse_skyscanner_page(html)
-
-            if parsed["price"] is None:
-                print(
-                    f"[WARN] No price found on page for {route['route_code']}. "
-                    f"Check if Skyscanner changed the layout."
-                )
-            else:
-                print(
-                    f"[OK] Cheapest visible flight price for {route['route_code']}: "
-                    f"{parsed['price_raw']} ({parsed['price']})"
-                )
-
-            row = {
-                "route_code": route["route_code"],
-                "origin": route["origin"],
-                "destination": route["destination"],
-                "route_name": route["route_name"],
-                "provider_name": PROVIDER_NAME,
-                "currency": parsed["currency"],
-                "price": parsed["price"],
-                "price_raw": parsed["price_raw"],
-                "url": url,
-                "travel_date": route.get("travel_date"),
-            }
-            results.append(row)
+    except httpx.HTTPError as e:
+        log.warning(
+            "Skipping flight %s due to HTTP/network error: %s",
+            route["route_code"], e,
+        )
+    except Exception as e:
+        log.warning(
+            "Skipping flight %s due to unexpected error: %s",
+            route["route_code"], e,
+        )
+    return None
 
-            # be polite, avoid hammering
-            time.sleep(random.uniform(1.0, 2.5))
 
-        except RequestException as e:
-            print(
-                f"[WARN] Skipping flight {route['route_code']} due to HTTP/network error: {e}"
-            )
-        except Exception as e:
-            print(
-                f"[WARN] Skipping flight {route['route_code']} due to unexpected error: {e}"
-            )
+async def _scrape_flight_prices_async() -> List[FlightRow]:
+    return await _scrape_phase(
+        FLIGHT_ROUTES, _scrape_flight_route, "route_code", "travel_date"
+    )
 
-    return results
+
+def scrape_flight_prices() -> List[FlightRow]:
+    """
+    Scrape all configured flight routes from Skyscanner via Thordata,
+    fetching up to MAX_CONCURRENT_FETCHES routes concurrently.
+    Returns a list of FlightRow ready for DB insertion (without timestamp).
+    """
+    return asyncio.run(_scrape_flight_prices_async())
 
 
 # ---------------------------------------------------------------------------
 # OYO (Hotels)
 # ---------------------------------------------------------------------------
 
+# Travel date parsed once; every OYO URL and hotel row derives from it.
+# One-night stay: check in on the travel date, check out the next day.
+_TRAVEL_DT = datetime.datetime.strptime(TRAVEL_DATE_STR, "%Y-%m-%d").date()
+_CHECKOUT_DT = _TRAVEL_DT + datetime.timedelta(days=1)
+_CHECKIN_ISO = _TRAVEL_DT.isoformat()
+_CHECKOUT_ISO = _CHECKOUT_DT.isoformat()
+_CHECKIN_DMY = _TRAVEL_DT.strftime("%d/%m/%Y")
+_CHECKOUT_DMY = _CHECKOUT_DT.strftime("%d/%m/%Y")
+
+# Date + sort=price ascending parameters added to every OYO city URL
+_OYO_PARAMS = {
+    "checkin": _CHECKIN_DMY,
+    "checkout": _CHECKOUT_DMY,
+    "guests": "1",
+    "rooms": "1",
+    "sort": "price",
+    "sortOrder": "ascending",
+}
+# ...and pre-encoded once for the common case of a bare city URL
+_OYO_QS = urlencode(_OYO_PARAMS)
+
+
 def _build_oyo_url_with_dates(base_url: str) -> str:
     """
     Take a base city URL like:
         https://www.oyorooms.com/hotels-in-chennai/
     and attach date + sort=price ascending for TRAVEL_DATE_STR
     so that the first card is truly the cheapest for that date.
+    Any query already on base_url is kept; our parameters override
+    same-named ones and a #fragment stays at the end.
     """
-    travel_dt = datetime.datetime.strptime(TRAVEL_DATE_STR, "%Y-%m-%d").date()
-    checkin_dt = travel_dt
-    checkout_dt = travel_dt + datetime.timedelta(days=1)
+    if "?" not in base_url and "#" not in base_url:
+        return f"{base_url}?{_OYO_QS}"
 
-    checkin_str = checkin_dt.strftime("%d/%m/%Y")
-    checkout_str = checkout_dt.strftime("%d/%m/%Y")
+    parts = urlsplit(base_url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    params.update(_OYO_PARAMS)
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def _extract_oyo_price(full_text: str) -> Tuple[Optional[float], str]:
+    # Consider only the first N values (top part of page/cards), read IN
+    # ORDER with str.find so the scan stops as soon as N are found. The
+    # minimum is tracked as we go: `best` ignores silly small numbers
+    # (fees, etc.) below 300, `lowest` is the fallback if all are below it.
+    N = 20
+    seen = 0
+    best = None
+    lowest = None
+    n = len(full_text)
+    pos = 0
+    while seen < N:
+        i = full_text.find("₹", pos)
+        if i < 0:
+            break
+        j = i + 1
+        while j < n and full_text[j].isspace():
+            j += 1
+        k = j
+        while k < n and (full_text[k].isdigit() or full_text[k] == ","):
+            k += 1
+        pos = max(k, i + 1)
+        if k == j:
+            continue
+        try:
+            value = int(full_text[j:k].replace(",", ""))
+        except ValueError:
+            continue
+
+        seen += 1
+        if lowest is None or value < lowest:
+            lowest = value
+        if value >= 300 and (best is None or value < best):
+            best = value
+
+    chosen = best if best is not None else lowest
+    if chosen is None:
+        return None, ""
+    return float(chosen), f"₹ {chosen:,}"
 
-    params = {
-        "checkin": checkin_str,
-        "checkout": checkout_str,
-        "guests": "1",
-        "rooms": "1",
-        "sort": "price",
-        "sortOrder": "ascending",
-    }
 
-    query = urlencode(params)
-    sep = "&" if "?" in base_url else "?"
-    return f"{base_url}{sep}{query}"
+# parse_oyo_page only uses the first 20 prices on the (price-sorted) page;
+# stop downloading once this many '₹' signs – with headroom for ones inside
+# tags/scripts – have been received.
+OYO_STREAM_PRICES = 30
 
 
-def parse_oyo_page(html: str) -> Dict[str, Any]:
+def parse_oyo_page(html: str, max_chars: int = MAX_TEXT_CHARS) -> Dict[str, Any]:
     """
     Parse an OYO city/bucket page that is already:
       - filtered to a city, and
@@ -219,152 +704,148 @@ def parse_oyo_page(html: str) -> Dict[str, Any]:
       - Only look at the first N matches (e.g. 20), trusting the sort=price asc.
       - Ignore obviously bogus tiny numbers (< 300).
       - Take the minimum of what remains as the "starting from" price.
+
+    Text comes from _page_text(); BeautifulSoup is only used when that
+    yields no price at all. Only the first max_chars of text are scanned.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    full_text = soup.get_text(" ", strip=True)
+    price, price_raw = _extract_oyo_price(_page_text(html)[:max_chars])
+    if price is None:
+        price, price_raw = _extract_oyo_price(_dom_text(html)[:max_chars])
 
-    price = None
-    price_raw = ""
+    return {
+        "currency": "INR",
+        "price": price,
+        "price_raw": price_raw,
+    }
 
-    # Get matches IN ORDER
-    ordered_values: List[int] = []
-    for m in re.finditer(r"₹\s*([\d,]+)", full_text):
-        num_str = m.group(1)
-        try:
-            ordered_values.append(int(num_str.replace(",", "")))
-        except ValueError:
-            continue
 
-    # Consider only the first N values (top part of page/cards)
-    N = 20
-    top_values = ordered_values[:N]
+async def _scrape_hotel_stay(
+    stay: Dict[str, Any], sem: asyncio.Semaphore
+) -> Optional[HotelRow]:
+    raw_url_value = stay["url"]
+    base_urls = (
+        raw_url_value
+        if isinstance(raw_url_value, (list, tuple))
+        else (raw_url_value,)
+    )
+
+    # Build dated + sorted URLs for each base
+    candidate_urls = [_build_oyo_url_with_dates(bu) for bu in base_urls]
+
+    log.info(
+        "Scraping OYO bucket %s in %s – %s",
+        stay["hotel_name"], stay["city"], candidate_urls[0],
+    )
 
-    if top_values:
-        # Filter out silly small numbers (fees, etc.)
-        filtered = [v for v in top_values if v >= 300]
+    chosen_url = None
+    html = None
 
-        chosen = None
-        if filtered:
-            chosen = min(filtered)
+    # Try each URL until one works
+    for candidate in candidate_urls:
+        try:
+            html = await _fetch_page_async(
+                candidate, sem, timeout=40, stop_after_prices=OYO_STREAM_PRICES
+            )
+            chosen_url = candidate
+            break
+        except httpx.HTTPError as e:
+            log.warning(
+                "OYO attempt failed for %s at %s: %s",
+                stay["hotel_code"], candidate, e,
+            )
+        except Exception as e:
+            log.warning(
+                "Unexpected error fetching %s for %s: %s",
+                candidate, stay["hotel_code"], e,
+            )
+
+    if html is None:
+        log.warning(
+            "Could not fetch any URL for %s. Skipping this OYO bucket.",
+            stay["hotel_code"],
+        )
+        return None
+
+    try:
+        parsed = parse_oyo_page(html)
+        if parsed["price"] is None:
+            log.warning(
+                "No OYO price found on page for %s. "
+                "Check if layout/selector needs updating.",
+                stay["hotel_code"],
+            )
         else:
-            # Fallback: if, for some weird reason, everything < 300
-            chosen = min(top_values) if top_values else None
+            log.info(
+                "Parsed OYO price for %s: %s (%s)",
+                stay["hotel_code"], parsed["price_raw"], parsed["price"],
+            )
 
-        if chosen is not None:
-            price = float(chosen)
-            price_raw = f"₹ {chosen:,}"
+        # IMPORTANT: url must be a plain string for DB insert.
+        # Dates are the same check-in/checkout we used in the URL, for clarity.
+        return HotelRow(
+            hotel_code=stay["hotel_code"],
+            city=stay["city"],
+            hotel_name=stay["hotel_name"],
+            provider_name="OYO",
+            currency=parsed["currency"],
+            price=parsed["price"],
+            price_raw=parsed["price_raw"],
+            url=chosen_url,
+            checkin_date=_CHECKIN_ISO,
+            checkout_date=_CHECKOUT_ISO,
+        )
 
-    return {
-        "currency": "INR",
-        "price": price,
-        "price_raw": price_raw,
-    }
+    except Exception as e:
+        log.warning("Error parsing hotel %s: %s", stay["hotel_code"], e)
+    return None
 
 
-def scrape_hotel_rates() -> List[Dict[str, Any]]:
+async def _scrape_hotel_rates_async() -> List[HotelRow]:
+    return await _scrape_phase(
+        HOTEL_STAYS, _scrape_hotel_stay, "hotel_code", "checkin_date"
+    )
+
+
+def scrape_hotel_rates() -> List[HotelRow]:
     """
-    Scrape hotel "buckets" from OYO via Thordata.
+    Scrape hotel "buckets" from OYO via Thordata, several cities at once.
 
     For each city:
       - Start from a base URL in HOTEL_STAYS (e.g. hotels-in-chennai/).
       - Build a date-specific, price-sorted URL for TRAVEL_DATE_STR:
             ?checkin=07/12/2025&checkout=08/12/2025&sort=price&sortOrder=ascending
-      - If the config url is a list (like Mumbai), apply that to each candidate.
+      - If the config url is a tuple of fallbacks (like Mumbai), apply that to each candidate.
       - Parse only the first block of prices to get a realistic "starting from" rate.
     """
-    results: List[Dict[str, Any]] = []
-
-    for stay in HOTEL_STAYS:
-        raw_url_value = stay["url"]
-        base_urls = (
-            raw_url_value if isinstance(raw_url_value, list) else [raw_url_value]
-        )
+    return asyncio.run(_scrape_hotel_rates_async())
 
-        # Build dated + sorted URLs for each base
-        candidate_urls = [_build_oyo_url_with_dates(bu) for bu in base_urls]
 
-        print(
-            f"\n[INFO] Scraping OYO bucket {stay['hotel_name']} "
-            f"in {stay['city']} – {candidate_urls[0]}"
-        )
-
-        chosen_url = None
-        html = None
-
-        # Try each URL until one works
-        for candidate in candidate_urls:
-            try:
-                html = fetch_page(candidate, timeout=40)
-                chosen_url = candidate
-                break
-            except RequestException as e:
-                print(
-                    f"[WARN] OYO attempt failed for {stay['hotel_code']} at "
-                    f"{candidate}: {e}"
-                )
-            except Exception as e:
-                print(
-                    f"[WARN] Unexpected error fetching {candidate} for "
-                    f"{stay['hotel_code']}: {e}"
-                )
-
-        if html is None:
-            print(
-                f"[WARN] Could not fetch any URL for {stay['hotel_code']}. "
-                f"Skipping this OYO bucket."
-            )
-            continue
+# ---------------------------------------------------------------------------
+# Gozo Cabs (Rental cars)
+# ---------------------------------------------------------------------------
 
+def _extract_gozo_price(full_text: str) -> Tuple[Optional[float], str]:
+    # Single pass over the matches: `best` skips garbage like 0 / < 100,
+    # `lowest` is the fallback if everything was < 100 for some reason.
+    best = None
+    lowest = None
+    for m in _PRICE_RE.finditer(full_text):
         try:
-            parsed = parse_oyo_page(html)
-            if parsed["price"] is None:
-                print(
-                    f"[WARN] No OYO price found on page for {stay['hotel_code']}. "
-                    f"Check if layout/selector needs updating."
-                )
-            else:
-                print(
-                    f"[OK] Parsed OYO price for {stay['hotel_code']}: "
-                    f"{parsed['price_raw']} ({parsed['price']})"
-                )
-
-            # Use the actual check-in/checkout we used in the URL, for clarity
-            travel_dt = datetime.datetime.strptime(TRAVEL_DATE_STR, "%Y-%m-%d").date()
-            checkin_dt = travel_dt
-            checkout_dt = travel_dt + datetime.timedelta(days=1)
-            checkin_str = checkin_dt.strftime("%Y-%m-%d")
-            checkout_str = checkout_dt.strftime("%Y-%m-%d")
-
-            # IMPORTANT: url must be a plain string for DB insert
-            row = {
-                "hotel_code": stay["hotel_code"],
-                "city": stay["city"],
-                "hotel_name": stay["hotel_name"],
-                "provider_name": "OYO",
-                "currency": parsed["currency"],
-                "price": parsed["price"],
-                "price_raw": parsed["price_raw"],
-                "url": chosen_url,
-                "checkin_date": checkin_str,
-                "checkout_date": checkout_str,
-            }
-            results.append(row)
-
-            time.sleep(random.uniform(1.0, 2.0))
-
-        except Exception as e:
-            print(
-                f"[WARN] Error parsing hotel {stay['hotel_code']}: {e}"
-            )
+            value = int(m.group(1).replace(",", ""))
+        except ValueError:
+            continue
+        if lowest is None or value < lowest:
+            lowest = value
+        if value >= 100 and (best is None or value < best):
+            best = value
 
-    return results
+    chosen = best if best is not None else lowest
+    if chosen is None:
+        return None, ""
+    return float(chosen), f"₹ {chosen:,}"
 
 
-# ---------------------------------------------------------------------------
-# Gozo Cabs (Rental cars)
-# ---------------------------------------------------------------------------
-
-def parse_gozo_page(html: str) -> Dict[str, Any]:
+def parse_gozo_page(html: str, max_chars: int = MAX_TEXT_CHARS) -> Dict[str, Any]:
     """
     Parse a Gozo Cabs route page.
 
@@ -373,35 +854,13 @@ def parse_gozo_page(html: str) -> Dict[str, Any]:
       - Ignore obviously wrong values like 0 or very tiny numbers (< 100),
         since these are usually "₹ 0 cancellation fee", etc.
       - Take the minimum of the remaining values as a reasonable "starting from" price.
-    """
-    soup = BeautifulSoup(html, "html.parser")
-    full_text = soup.get_text(" ", strip=True)
 
-    matches = re.findall(r"₹\s*([\d,]+)", full_text)
-    price = None
-    price_raw = ""
-
-    if matches:
-        values: List[int] = []
-        for val in matches:
-            try:
-                values.append(int(val.replace(",", "")))
-            except ValueError:
-                continue
-
-        # Filter out garbage like 0 / < 100
-        filtered = [v for v in values if v >= 100]
-
-        chosen = None
-        if filtered:
-            chosen = min(filtered)
-        elif values:
-            # fallback if everything was < 100 for some reason
-            chosen = min(values)
-
-        if chosen is not None:
-            price = float(chosen)
-            price_raw = f"₹ {chosen:,}"
+    Text comes from _page_text(); BeautifulSoup is only used when that
+    yields no price at all. Only the first max_chars of text are scanned.
+    """
+    price, price_raw = _extract_gozo_price(_page_text(html)[:max_chars])
+    if price is None:
+        price, price_raw = _extract_gozo_price(_dom_text(html)[:max_chars])
 
     return {
         "currency": "INR",
@@ -410,60 +869,92 @@ def parse_gozo_page(html: str) -> Dict[str, Any]:
     }
 
 
-def scrape_rental_car_prices() -> List[Dict[str, Any]]:
-    """
-    Scrape configured rental cab routes (Gozo Cabs) via Thordata.
-    Returns a list of dicts ready for DB insertion (without timestamp).
-    """
-    results: List[Dict[str, Any]] = []
+async def _scrape_rental_offer(
+    offer: Dict[str, Any], sem: asyncio.Semaphore
+) -> Optional[RentalRow]:
+    url = offer["url"]
+    log.info(
+        "Scraping rental cab %s (%s) – Gozo Cabs – %s",
+        offer["route_name"], offer["rental_code"], url,
+    )
 
-    for offer in RENTAL_CAR_OFFERS:
-        url = offer["url"]
-        print(
-            f"\n[INFO] Scraping rental cab {offer['route_name']} "
-            f"({offer['rental_code']}) – Gozo Cabs – {url}"
-        )
+    try:
+        html = await _fetch_page_async(url, sem, timeout=40)
+        parsed = parse_gozo_page(html)
 
-        try:
-            html = fetch_page(url, timeout=40)
-            parsed = parse_gozo_page(html)
-
-            if parsed["price"] is None:
-                print(
-                    f"[WARN] No rental price found on page for {offer['rental_code']}. "
-                    f"Check if layout/selector needs updating."
-                )
-            else:
-                print(
-                    f"[OK] Lowest visible cab price for {offer['rental_code']}: "
-                    f"{parsed['price_raw']} ({parsed['price']})"
-                )
-
-            row = {
-                "rental_code": offer["rental_code"],
-                "pickup_city": offer["pickup_city"],
-                "dropoff_city": offer["dropoff_city"],
-                "pickup_date": offer.get("travel_date"),
-                "dropoff_date": None,
-                "route_name": offer["route_name"],
-                "provider_name": "Gozo Cabs",
-                "currency": parsed["currency"],
-                "price": parsed["price"],
-                "price_raw": parsed["price_raw"],
-                "url": url,
-                "travel_date": offer.get("travel_date"),
-            }
-            results.append(row)
-
-            time.sleep(random.uniform(1.0, 2.0))
-
-        except RequestException as e:
-            print(
-                f"[WARN] Skipping rental {offer['rental_code']} due to HTTP/network error: {e}"
+        if parsed["price"] is None:
+            log.warning(
+                "No rental price found on page for %s. "
+                "Check if layout/selector needs updating.",
+                offer["rental_code"],
             )
-        except Exception as e:
-            print(
-                f"[WARN] Skipping rental {offer['rental_code']} due to unexpected error: {e}"
+        else:
+            log.info(
+                "Lowest visible cab price for %s: %s (%s)",
+                offer["rental_code"], parsed["price_raw"], parsed["price"],
             )
 
-    return results
\ No newline at end of file
+        return RentalRow(
+            rental_code=offer["rental_code"],
+            pickup_city=offer["pickup_city"],
+            dropoff_city=offer["dropoff_city"],
+            pickup_date=offer.get("travel_date"),
+            dropoff_date=None,
+            route_name=offer["route_name"],
+            provider_name="Gozo Cabs",
+            currency=parsed["currency"],
+            price=parsed["price"],
+            price_raw=parsed["price_raw"],
+            url=url,
+            travel_date=offer.get("travel_date"),
+        )
+
+    except httpx.HTTPError as e:
+        log.warning(
+            "Skipping rental %s due to HTTP/network error: %s",
+            offer["rental_code"], e,
+        )
+    except Exception as e:
+        log.warning(
+            "Skipping rental %s due to unexpected error: %s",
+            offer["rental_code"], e,
+        )
+    return None
+
+
+async def _scrape_rental_car_prices_async() -> List[RentalRow]:
+    return await _scrape_phase(
+        RENTAL_CAR_OFFERS, _scrape_rental_offer, "rental_code", "travel_date"
+    )
+
+
+def scrape_rental_car_prices() -> List[RentalRow]:
+    """
+    Scrape configured rental cab routes (Gozo Cabs) via Thordata,
+    fetching up to MAX_CONCURRENT_FETCHES routes concurrently.
+    Returns a list of RentalRow ready for DB insertion (without timestamp).
+    """
+    return asyncio.run(_scrape_rental_car_prices_async())
+
+
+# ---------------------------------------------------------------------------
+# All providers
+# ---------------------------------------------------------------------------
+
+async def _scrape_all_async():
+    return await asyncio.gather(
+        _scrape_flight_prices_async(),
+        _scrape_hotel_rates_async(),
+        _scrape_rental_car_prices_async(),
+    )
+
+
+def scrape_all() -> Tuple[List[FlightRow], List[HotelRow], List[RentalRow]]:
+    """
+    Scrape flights, hotels and rental cabs at the same time. The three
+    providers live on different hosts, so their phases overlap on one event
+    loop, each still capped at MAX_CONCURRENT_FETCHES pages in flight.
+    Returns (flight_rows, hotel_rows, rental_rows).
+    """
+    flight_rows, hotel_rows, rental_rows = asyncio.run(_scrape_all_async())
+    return flight_rows, hotel_rows, rental_rows